@@ -0,0 +1,199 @@
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+
+# Everything reporting/app.py imports before its first page is rendered; the
+# first script run always reaches the chart fragment.
+FIRST_RENDER_MODULES = [
+    "streamlit",
+    "reporting.connection",
+    "reporting.query_registry",
+    "reporting.runner",
+    "reporting.charts.lap_times_chart",
+    "reporting.charts.fastest_team_chart",
+]
+DEFAULT_TARGETS = {"first_render": FIRST_RENDER_MODULES}
+# Number of previous runs whose median is the regression baseline
+BASELINE_WINDOW = 5
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of `python -X importtime` into per-module timings."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # Header line
+            continue
+        timings.append(ImportTiming(parts[2].strip(), self_us, cumulative_us))
+    return timings
+
+
+def measure(modules: list[str], python: str = sys.executable) -> list[ImportTiming]:
+    """Import `modules` in one fresh interpreter and return the import timings."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(timings: list[ImportTiming], top: int) -> dict:
+    """Return the total import time and the slowest top-level packages."""
+    by_package: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        by_package[timing.module.split(".")[0]] += timing.self_us
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(sum(by_package.values()) / 1000, 1),
+        "packages": {name: round(us / 1000, 1) for name, us in slowest[:top]},
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(targets: dict[str, list[str]], repeat: int, top: int) -> dict:
+    """Benchmark each target, keeping the fastest of `repeat` cold imports."""
+    results = {}
+    for name, modules in targets.items():
+        runs = [summarize(measure(modules), top=top) for _ in range(repeat)]
+        results[name] = min(runs, key=lambda summary: summary["total_ms"])
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def load_history(path: str) -> list[dict]:
+    """Return the reports previously appended to a history file."""
+    history_path = Path(path)
+    if not history_path.exists():
+        return []
+    return [json.loads(line) for line in history_path.read_text().splitlines() if line]
+
+
+def compare_to_history(
+    report: dict, history: list[dict], window: int = BASELINE_WINDOW
+) -> dict[str, float]:
+    """Return, per target, the median total of its last `window` recorded runs."""
+    baselines = {}
+    for name in report["results"]:
+        previous = [
+            entry["results"][name]["total_ms"]
+            for entry in history
+            if name in entry.get("results", {})
+        ][-window:]
+        if previous:
+            baselines[name] = statistics.median(previous)
+    return baselines
+
+
+def print_report(report: dict) -> None:
+    for name, summary in report["results"].items():
+        print(f"{name}: {summary['total_ms']:.1f} ms")
+        for package, ms in summary["packages"].items():
+            print(f"    {package:<30} {ms:>8.1f} ms")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report cold-start import time (python -X importtime)."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="Benchmark these modules one by one instead of the first render.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--history", help="Append the report as a JSON line to this file."
+    )
+    parser.add_argument(
+        "--max-regression-pct",
+        type=float,
+        help="Exit with an error if any target is this much slower than the median "
+        "of the last runs in --history.",
+    )
+    parser.add_argument(
+        "--max-total-ms",
+        type=float,
+        help="Exit with an error if any target takes longer than this to import.",
+    )
+    args = parser.parse_args(argv)
+
+    targets = (
+        {module: [module] for module in args.modules}
+        if args.modules
+        else DEFAULT_TARGETS
+    )
+    report = run(targets=targets, repeat=args.repeat, top=args.top)
+    print_report(report)
+
+    failed = False
+    if args.history:
+        baselines = compare_to_history(report, load_history(args.history))
+        for name, baseline in baselines.items():
+            total_ms = report["results"][name]["total_ms"]
+            change_pct = (total_ms - baseline) / baseline * 100
+            print(
+                f"{name}: {change_pct:+.1f}% vs median of previous runs ({baseline} ms)"
+            )
+            if (
+                args.max_regression_pct is not None
+                and change_pct > args.max_regression_pct
+            ):
+                print(f"{name} regressed by more than {args.max_regression_pct}%")
+                failed = True
+        with open(args.history, "a") as file:
+            file.write(json.dumps(report) + "\n")
+
+    if args.max_total_ms is not None:
+        slow = [
+            name
+            for name, summary in report["results"].items()
+            if summary["total_ms"] > args.max_total_ms
+        ]
+        if slow:
+            print(f"Import time budget of {args.max_total_ms} ms exceeded: {slow}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
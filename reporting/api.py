@@ -0,0 +1,449 @@
+import argparse
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+from itertools import chain
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterator
+from urllib.parse import parse_qs, urlsplit
+import zlib
+
+import pandas as pd
+import pyarrow as pa
+
+from reporting.connection import LocalDuckDBConnection, MotherDuckConnection
+from reporting.query_registry import QueryRegistry
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Endpoint name -> (data query, version query)
+ENDPOINTS: dict[str, tuple[str, str]] = {
+    "race-weekends": ("f1_race_weekends", "f1_race_weekends_version"),
+    "laps": ("f1_laps", "f1_session_version"),
+    "drivers": ("f1_drivers", "f1_session_version"),
+}
+
+ROUTE_PATTERN = re.compile(
+    r"^/(?:(?P<race_weekends>race-weekends)"
+    r"|sessions/(?P<sessions_key>-?\d+)/(?P<endpoint>laps|drivers))/?$"
+)
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class LRUCache:
+    """Small thread-safe LRU cache used for query results and encoded bodies."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def available_encodings() -> list[str]:
+    """Return the supported content codings, most preferred first."""
+    encodings = ["gzip"]
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def _parse_qvalue(params: str) -> float:
+    """Return the q-value of an Accept-Encoding entry, 1 if missing or malformed."""
+    match = re.search(r"q=([^;\s]*)", params)
+    if match is None:
+        return 1.0
+    try:
+        qvalue = float(match.group(1))
+    except ValueError:
+        return 1.0
+    return qvalue if 0 <= qvalue <= 1 else 1.0
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    """Pick a content coding from an Accept-Encoding header, `identity` if none fits.
+
+    Codings are ranked by q-value; ties go to the server preference of
+    `available_encodings`.
+    """
+    if not accept_encoding:
+        return "identity"
+    qvalues = {}
+    for token in accept_encoding.split(","):
+        coding, _, params = token.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding:
+            qvalues[coding] = _parse_qvalue(params)
+    wildcard = qvalues.get("*")
+
+    best, best_qvalue = None, 0.0
+    for encoding in available_encodings():
+        qvalue = qvalues.get(encoding, wildcard or 0.0)
+        if qvalue > best_qvalue:
+            best, best_qvalue = encoding, qvalue
+
+    # identity is acceptable unless refused, but only wins when ranked higher
+    identity_qvalue = qvalues.get("identity", wildcard)
+    if best is not None and (identity_qvalue is None or best_qvalue >= identity_qvalue):
+        return best
+    if identity_qvalue == 0:
+        raise ApiError(HTTPStatus.NOT_ACCEPTABLE, "No acceptable content coding")
+    return "identity"
+
+
+def negotiate_format(query: dict[str, list[str]], accept: str | None) -> str:
+    """Pick `json` or `arrow` from a `format` parameter or the Accept header."""
+    requested = query.get("format", [None])[0]
+    if requested is None:
+        return "arrow" if accept and ARROW_MEDIA_TYPE in accept else "json"
+    if requested not in ("json", "arrow"):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unsupported format `{requested}`")
+    return requested
+
+
+def _compressor(encoding: str) -> Any:
+    if encoding == "gzip":
+        return zlib.compressobj(wbits=31)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor().compressobj()
+    return None
+
+
+def compress_chunks(chunks: Iterator[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a stream of chunks with the given content coding."""
+    compressor = _compressor(encoding)
+    if compressor is None:
+        yield from chunks
+        return
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_json(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    """Serialize a dataframe as a JSON array of records, `chunk_rows` at a time."""
+    yield b"["
+    for start in range(0, len(df), chunk_rows):
+        records = df.iloc[start : start + chunk_rows].to_json(
+            orient="records", date_format="iso"
+        )
+        prefix = "," if start else ""
+        yield (prefix + records[1:-1]).encode("utf-8")
+    yield b"]"
+
+
+def iter_arrow(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    """Serialize a dataframe as an Arrow IPC stream, one record batch at a time."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        yield drain()
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            writer.write_batch(batch)
+            yield drain()
+    yield drain()
+
+
+SERIALIZERS: dict[str, tuple[str, Callable[[pd.DataFrame, int], Iterator[bytes]]]] = {
+    "json": (JSON_MEDIA_TYPE, iter_json),
+    "arrow": (ARROW_MEDIA_TYPE, iter_arrow),
+}
+
+
+@dataclass
+class ReportingApi:
+    query_registry: QueryRegistry
+    connection: MotherDuckConnection
+    chunk_rows: int = 5000
+    # Seconds a data version is trusted before the warehouse is asked again
+    version_ttl: float = 5.0
+    version_cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=256))
+    result_cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=64))
+    body_cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=128))
+
+    def _params(self, sessions_key: int | None) -> list[Any] | None:
+        return None if sessions_key is None else [sessions_key]
+
+    def _to_version(self, version_df: pd.DataFrame, sessions_key: int | None) -> str:
+        if sessions_key is not None and not version_df.iloc[0]["lap_count"]:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown session `{sessions_key}`")
+        row = version_df.iloc[0].to_json(date_format="iso")
+        return hashlib.sha1(row.encode("utf-8")).hexdigest()[:16]
+
+    def _remember_version(
+        self, endpoint: str, sessions_key: int | None, version: str
+    ) -> None:
+        _, version_query = ENDPOINTS[endpoint]
+        expires_at = time.monotonic() + self.version_ttl
+        self.version_cache.set((version_query, sessions_key), (expires_at, version))
+
+    def get_version(self, endpoint: str, sessions_key: int | None = None) -> str:
+        """Return a short hash identifying the current version of the endpoint data.
+
+        Versions are cached for `version_ttl` seconds, so revalidations within that
+        window are answered without a warehouse round-trip.
+        """
+        _, version_query = ENDPOINTS[endpoint]
+        cached = self.version_cache.get((version_query, sessions_key))
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        log.info(f"Executing query `{version_query}`...")
+        version_df = self.connection.execute_query(
+            self.query_registry.get_query(query_name=version_query),
+            params=self._params(sessions_key),
+        )
+        version = self._to_version(version_df, sessions_key)
+        self._remember_version(endpoint, sessions_key, version)
+        return version
+
+    def get_snapshot(
+        self, endpoint: str, version: str, sessions_key: int | None = None
+    ) -> tuple[str, pd.DataFrame]:
+        """Return the endpoint data and the version it was read at.
+
+        On a cache miss the version and the data are read in one transaction, so the
+        returned version may be newer than `version` but always matches the data.
+        """
+        df = self.result_cache.get((endpoint, sessions_key, version))
+        if df is not None:
+            return version, df
+
+        query_name, version_query = ENDPOINTS[endpoint]
+        params = self._params(sessions_key)
+        log.info(f"Executing queries `{version_query}`, `{query_name}`...")
+        version_df, df = self.connection.execute_queries(
+            [
+                (self.query_registry.get_query(query_name=version_query), params),
+                (self.query_registry.get_query(query_name=query_name), params),
+            ]
+        )
+        version = self._to_version(version_df, sessions_key)
+        self._remember_version(endpoint, sessions_key, version)
+        self.result_cache.set((endpoint, sessions_key, version), df)
+        return version, df
+
+    def get_body(
+        self,
+        endpoint: str,
+        version: str,
+        sessions_key: int | None,
+        fmt: str,
+        encoding: str,
+    ) -> tuple[str, Iterator[bytes]]:
+        """Return the data version and the encoded response body stream."""
+        cached = self.body_cache.get((endpoint, sessions_key, version, fmt, encoding))
+        if cached is not None:
+            return version, iter(cached)
+
+        version, df = self.get_snapshot(endpoint, version, sessions_key)
+        cache_key = (endpoint, sessions_key, version, fmt, encoding)
+        return version, self._iter_body(df, cache_key, fmt, encoding)
+
+    def _iter_body(
+        self, df: pd.DataFrame, cache_key: tuple, fmt: str, encoding: str
+    ) -> Iterator[bytes]:
+        """Stream the encoded response body, caching it once fully sent."""
+        _, serializer = SERIALIZERS[fmt]
+        chunks = []
+        for chunk in compress_chunks(serializer(df, self.chunk_rows), encoding):
+            if chunk:
+                chunks.append(chunk)
+                yield chunk
+        self.body_cache.set(cache_key, chunks)
+
+
+class ReportingApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "ReportingApiServer"
+    headers_sent = False
+
+    def end_headers(self) -> None:
+        super().end_headers()
+        self.headers_sent = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.info("%s - %s", self.address_string(), format % args)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", JSON_MEDIA_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunked(self, chunks: Iterator[bytes]) -> None:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_GET(self) -> None:
+        self.headers_sent = False
+        try:
+            self._handle_get()
+        except (BrokenPipeError, ConnectionResetError):
+            log.info("Client disconnected while serving %s", self.path)
+            self.close_connection = True
+        except ApiError as e:
+            self._fail(e.status, e.message)
+        except Exception:
+            log.exception("Failed to serve %s", self.path)
+            self._fail(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+
+    def _fail(self, status: HTTPStatus, message: str) -> None:
+        # Once a 200 is on the wire, an error response would corrupt the chunked
+        # body; dropping the connection tells the client the response is truncated.
+        if self.headers_sent:
+            self.close_connection = True
+            return
+        self._send_error(status, message)
+
+    def _handle_get(self) -> None:
+        url = urlsplit(self.path)
+        route = ROUTE_PATTERN.match(url.path)
+        if route is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path `{url.path}`")
+
+        if route.group("race_weekends"):
+            endpoint, sessions_key = "race-weekends", None
+        else:
+            endpoint = route.group("endpoint")
+            sessions_key = int(route.group("sessions_key"))
+
+        fmt = negotiate_format(parse_qs(url.query), self.headers.get("Accept"))
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+
+        api = self.server.api
+        version = api.get_version(endpoint, sessions_key)
+        etag = f'W/"{version}-{fmt}"'
+
+        if_none_match = self.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        media_type, _ = SERIALIZERS[fmt]
+        version, body = api.get_body(endpoint, version, sessions_key, fmt, encoding)
+        etag = f'W/"{version}-{fmt}"'
+        # Pull the first chunk before committing to a 200 so query errors still
+        # surface as a proper error response.
+        first_chunk = next(body, b"")
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", media_type)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunked(chain([first_chunk], body))
+
+
+class ReportingApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: ReportingApi):
+        super().__init__(address, ReportingApiHandler)
+        self.api = api
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve reporting queries over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--database",
+        help="Path to a local DuckDB file; defaults to the MotherDuck database.",
+    )
+    parser.add_argument(
+        "--version-ttl",
+        type=float,
+        default=5.0,
+        help="Seconds to trust a data version before checking the warehouse again.",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        stream=sys.stdout,
+        format="%(asctime)s %(name)s: %(levelname)-4s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        level=logging.INFO,
+    )
+
+    connection = (
+        LocalDuckDBConnection(database=args.database)
+        if args.database
+        else MotherDuckConnection()
+    )
+    api = ReportingApi(
+        query_registry=QueryRegistry(),
+        connection=connection,
+        version_ttl=args.version_ttl,
+    )
+    server = ReportingApiServer((args.host, args.port), api)
+    log.info("Serving reporting API on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
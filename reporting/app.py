@@ -1,6 +1,8 @@
 import sys
 import logging
 
+import streamlit as st
+
 from reporting.connection import MotherDuckConnection
 from reporting.query_registry import QueryRegistry
 from reporting.runner import ReportingRunner
@@ -15,7 +17,12 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-runner = ReportingRunner(
-    query_registry=QueryRegistry(), connection=MotherDuckConnection()
-)
-runner.run()
+@st.cache_resource
+def get_runner() -> ReportingRunner:
+    """Build the runner once per process instead of on every script run."""
+    return ReportingRunner(
+        query_registry=QueryRegistry(), connection=MotherDuckConnection()
+    )
+
+
+get_runner().run()
@@ -17,7 +17,6 @@ class MotherDuckSettings(BaseSettings):
 class MotherDuckConnection:
     def __init__(self):
         self._settings = None
-        self._connection: DuckDBPyConnection | None = None
 
     @property
     def settings(self) -> MotherDuckSettings:
@@ -25,20 +24,61 @@ class MotherDuckConnection:
             self._settings = MotherDuckSettings()
         return self._settings
 
+    @property
+    def connection_string(self) -> str:
+        return f"md:{self.settings.motherduck_database}?motherduck_token={self.settings.motherduck_token}"
+
+    @property
+    def connect_kwargs(self) -> dict[str, Any]:
+        return {}
+
     @contextmanager
     def connect(self) -> Generator[DuckDBPyConnection, None, None]:
+        # Keep the handle local so one instance can be shared between threads.
+        connection = None
         try:
-            conn_str = f"md:{self.settings.motherduck_database}?motherduck_token={self.settings.motherduck_token}"
-            self._connection = connect(database=conn_str)
-            yield self._connection
+            connection = connect(database=self.connection_string, **self.connect_kwargs)
+            yield connection
         except ConnectionException as e:
-            log.error("Could not connect to MotherDuck: %s", e)
+            log.error("Could not connect to %s: %s", type(self).__name__, e)
             raise
         finally:
-            if self._connection:
-                self._connection.close()
-                self._connection = None
+            if connection:
+                connection.close()
 
     def execute_query(self, query: str, params: list[Any] = None) -> DataFrame:
         with self.connect() as connection:
             return connection.execute(query, params).df()
+
+    def execute_queries(
+        self, queries: list[tuple[str, list[Any] | None]]
+    ) -> list[DataFrame]:
+        """Execute several queries against the same snapshot of the database."""
+        with self.connect() as connection:
+            connection.begin()
+            try:
+                return [
+                    connection.execute(query, params).df() for query, params in queries
+                ]
+            finally:
+                connection.rollback()
+
+
+class LocalDuckDBConnection(MotherDuckConnection):
+    """Connection to a local DuckDB file exposing the same schemas as MotherDuck.
+
+    Opened read-only by default so readers don't block the process loading the file.
+    """
+
+    def __init__(self, database: str, read_only: bool = True):
+        super().__init__()
+        self.database = database
+        self.read_only = read_only
+
+    @property
+    def connection_string(self) -> str:
+        return self.database
+
+    @property
+    def connect_kwargs(self) -> dict[str, Any]:
+        return {"read_only": self.read_only}
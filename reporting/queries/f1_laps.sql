@@ -34,7 +34,6 @@ select
     l.first_name || ' ' || l.last_name as driver_full_name,
     l.lap_number,
     l.lap_duration,
-    l.lap_duration_smoothened,
     avg_lap_duration,
     l.is_pit_in_lap,
     l.is_pit_out_lap,
@@ -0,0 +1,10 @@
+select
+    count(*) as session_count,
+    -- Order-independent hash over every column the race weekend endpoint returns
+    sum(hash(ds.dim_sessions_key, drw.year, drw.meeting_name, ds.date_start))::varchar
+        as rows_hash
+from
+    warehouse.modeling.dim_sessions ds
+inner join warehouse.modeling.dim_race_weekends drw
+on ds.dim_race_weekends_key = drw.dim_race_weekends_key
+where ds.session_name = 'Race'
@@ -0,0 +1,23 @@
+select
+    count(*) as lap_count,
+    -- Order-independent hash over every column the session endpoints return
+    sum(
+        hash(
+            l.meeting_name,
+            l.session_name,
+            l.name_acronym,
+            l.team_name,
+            l.first_name,
+            l.last_name,
+            l.lap_number,
+            l.lap_duration,
+            l.is_pit_in_lap,
+            l.is_pit_out_lap,
+            l.pit_duration,
+            l.team_colour
+        )
+    )::varchar as rows_hash
+from
+    warehouse.reporting.rpt_laps as l
+where
+    l.dim_sessions_key = ?
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import hashlib
 import logging
 
 import pandas as pd
@@ -8,10 +9,19 @@ from reporting.charts.fastest_team_chart import create_fastest_team_chart
 from reporting.charts.lap_times_chart import create_lap_times_chart
 from reporting.connection import MotherDuckConnection
 from reporting.query_registry import QueryRegistry
+from reporting.smoothing import SMOOTHING_POLICIES, smooth_lap_duration
 
 log = logging.getLogger(__name__)
 
 
+@st.cache_data(max_entries=64)
+def get_cached_smoothed_lap_duration(
+    sessions_key: int, data_version: str, policy: str, _laps_df: pd.DataFrame
+) -> pd.Series:
+    """Smooth lap durations once per process for each data version and policy."""
+    return smooth_lap_duration(_laps_df, policy=policy)
+
+
 @dataclass
 class ReportingRunner:
     query_registry: QueryRegistry
@@ -92,12 +102,18 @@ class ReportingRunner:
         )
         return selected_lap_range
 
-    def _select_smoothed_pit_laps(self) -> str:
-        """Handle smoothed lap duration selection UI and return selection."""
-        smooth_pit_laps = st.checkbox("Smoothen pit in/out laps")
-        if smooth_pit_laps:
-            return "lap_duration_smoothened"
-        return "lap_duration"
+    def _select_smoothing_policy(self) -> str:
+        """Handle lap smoothing selection UI and return the selected policy."""
+        return st.selectbox("Smoothen pit in/out laps", list(SMOOTHING_POLICIES))
+
+    def _get_smoothed_lap_duration(self, sessions_key: int, policy: str) -> pd.Series:
+        """Return smoothed lap durations, shared by all sessions viewing this data."""
+        return get_cached_smoothed_lap_duration(
+            sessions_key,
+            st.session_state.lap_data_version,
+            policy,
+            st.session_state.base_lap_data,
+        )
 
     def _process_lap_data(
         self, laps_df: pd.DataFrame
@@ -139,14 +155,32 @@ class ReportingRunner:
         if "drivers_data" not in st.session_state:
             st.session_state.drivers_data = get_cached_drivers(sessions_key)
 
-    def _apply_filters(self) -> pd.DataFrame:
+        if "lap_data_version" not in st.session_state:
+            row_hashes = pd.util.hash_pandas_object(st.session_state.base_lap_data)
+            st.session_state.lap_data_version = hashlib.sha1(
+                row_hashes.values
+            ).hexdigest()
+
+    def _clear_session_data(self) -> None:
+        """Drop the loaded session data so it is fetched again on the next load."""
+        st.session_state.pop("base_lap_data", None)
+        st.session_state.pop("drivers_data", None)
+        st.session_state.pop("lap_data_version", None)
+
+    def _refresh_session_data(self, sessions_key: int) -> None:
+        """Reload the session data and drop the smoothed lap durations cached for it."""
+        self._clear_session_data()
+        get_cached_smoothed_lap_duration.clear()
+        self._load_all_session_data(sessions_key)
+
+    def _apply_filters(self, sessions_key: int) -> pd.DataFrame:
         """Apply filters to the base lap data and return filtered dataframe."""
         laps_df = st.session_state.base_lap_data.copy()
         drivers_df = st.session_state.drivers_data.copy()
 
         teams_filter, drivers_filter = self._select_drivers_teams(drivers_df=drivers_df)
         selected_lap_range = self._select_lap_range(laps_df=laps_df)
-        lap_duration_column = self._select_smoothed_pit_laps()
+        smoothing_policy = self._select_smoothing_policy()
 
         if teams_filter:
             laps_df = laps_df[laps_df["team_name"].isin(teams_filter)]
@@ -156,7 +190,9 @@ class ReportingRunner:
         laps_df = laps_df[
             laps_df["lap_number"].between(selected_lap_range[0], selected_lap_range[1])
         ]
-        laps_df["lap_duration_selected"] = laps_df[lap_duration_column]
+        laps_df["lap_duration_selected"] = self._get_smoothed_lap_duration(
+            sessions_key, smoothing_policy
+        )
 
         return laps_df
 
@@ -167,7 +203,7 @@ class ReportingRunner:
         self._load_all_session_data(sessions_key)
 
         # Apply filters to the base data
-        filtered_df = self._apply_filters()
+        filtered_df = self._apply_filters(sessions_key)
 
         # Process and display
         laps_df, last_lap_df, min_laptime, max_laptime = self._process_lap_data(
@@ -184,11 +220,7 @@ class ReportingRunner:
         _, col_2 = st.columns(spec=[0.9, 0.11], gap="medium")
         with col_2:
             if st.button(label="Refresh Data", icon=":material/refresh:"):
-                # Clear all session state data to force reload
-                st.session_state.pop("base_lap_data", None)
-                st.session_state.pop("drivers_data", None)
-                # Reload the data
-                self._load_all_session_data(sessions_key)
+                self._refresh_session_data(sessions_key)
 
         create_fastest_team_chart(df=laps_df)
 
@@ -210,8 +242,7 @@ class ReportingRunner:
         # Check if race weekend changed
         if previous_race != current_race:
             # Clear session state and cached data
-            st.session_state.pop("base_lap_data", None)
-            st.session_state.pop("drivers_data", None)
+            self._clear_session_data()
             # Store new race weekend
             st.session_state.selected_race_weekend = current_race
 
@@ -0,0 +1,78 @@
+from typing import Callable
+
+import pandas as pd
+
+# Laps slower than this multiple of the driver's median lap (safety car, VSC,
+# red flag restarts, ...) are treated as outliers.
+OUTLIER_THRESHOLD = 1.1
+CLIP_PERCENTILES = (0.05, 0.95)
+
+
+def flag_outlier_laps(
+    df: pd.DataFrame, threshold: float = OUTLIER_THRESHOLD
+) -> pd.Series:
+    """Flag pit in/out laps, missing laps and laps far off the driver's median pace."""
+    driver_median = df.groupby("name_acronym")["lap_duration"].transform("median")
+    return (
+        df["is_pit_in_lap"].eq(True)
+        | df["is_pit_out_lap"].eq(True)
+        | df["lap_duration"].isna()
+        | (df["lap_duration"] > driver_median * threshold)
+    )
+
+
+def _clean_laps(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series, pd.Series]:
+    """Return laps ordered per driver, clean lap durations and driver medians."""
+    ordered = df.sort_values(["name_acronym", "lap_number"])
+    clean = ordered["lap_duration"].mask(flag_outlier_laps(ordered))
+    driver_median = clean.groupby(ordered["name_acronym"]).transform("median")
+    return ordered, clean, driver_median
+
+
+def interpolate_outlier_laps(df: pd.DataFrame) -> pd.Series:
+    """Linearly interpolate outlier laps between the surrounding clean laps.
+
+    Outliers without a clean lap on both sides fall back to the driver's median.
+    """
+    ordered, clean, driver_median = _clean_laps(df)
+    drivers = ordered["name_acronym"]
+    clean_lap_number = ordered["lap_number"].where(clean.notna())
+
+    prev_lap = clean_lap_number.groupby(drivers).ffill()
+    next_lap = clean_lap_number.groupby(drivers).bfill()
+    prev_duration = clean.groupby(drivers).ffill()
+    next_duration = clean.groupby(drivers).bfill()
+
+    weight = (ordered["lap_number"] - prev_lap) / (next_lap - prev_lap)
+    interpolated = prev_duration + (next_duration - prev_duration) * weight
+    smoothed = clean.fillna(interpolated).fillna(driver_median)
+    return smoothed.reindex(df.index)
+
+
+def median_outlier_laps(df: pd.DataFrame) -> pd.Series:
+    """Replace outlier laps with the driver's median clean lap."""
+    _, clean, driver_median = _clean_laps(df)
+    return clean.fillna(driver_median).reindex(df.index)
+
+
+def clip_percentile_laps(
+    df: pd.DataFrame, percentiles: tuple[float, float] = CLIP_PERCENTILES
+) -> pd.Series:
+    """Clip each driver's laps to the given percentiles of their lap durations."""
+    by_driver = df.groupby("name_acronym")["lap_duration"]
+    lower = by_driver.transform("quantile", percentiles[0])
+    upper = by_driver.transform("quantile", percentiles[1])
+    return df["lap_duration"].clip(lower=lower, upper=upper)
+
+
+SMOOTHING_POLICIES: dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    "None": lambda df: df["lap_duration"],
+    "Interpolate pit and outlier laps": interpolate_outlier_laps,
+    "Driver median for pit and outlier laps": median_outlier_laps,
+    "Clip to 5th-95th percentile": clip_percentile_laps,
+}
+
+
+def smooth_lap_duration(df: pd.DataFrame, policy: str) -> pd.Series:
+    """Return the lap durations of `df` smoothed with the given policy."""
+    return SMOOTHING_POLICIES[policy](df)
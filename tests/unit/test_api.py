@@ -0,0 +1,323 @@
+from http.client import HTTPConnection
+import io
+import json
+from pathlib import Path
+import socket
+import threading
+from unittest.mock import MagicMock
+import zlib
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+import reporting.api
+from reporting.api import (
+    ApiError,
+    ReportingApi,
+    ReportingApiServer,
+    negotiate_encoding,
+)
+from reporting.connection import LocalDuckDBConnection
+from reporting.query_registry import QueryRegistry
+
+
+def insert_lap(conn: duckdb.DuckDBPyConnection, lap_number: int, duration: float):
+    conn.execute(
+        """
+        insert into reporting.rpt_laps values
+        (1, 'Test GP', 'Race', 'VER', 'Red Bull', 'Max', 'Verstappen', ?, ?, ?,
+         false, false, null, '#3671C6')
+        """,
+        [lap_number, duration, duration],
+    )
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    # The queries address the `warehouse` catalog, which is the file name.
+    path = tmp_path / "warehouse.duckdb"
+    with duckdb.connect(str(path)) as conn:
+        conn.execute("create schema reporting")
+        conn.execute("create schema modeling")
+        conn.execute(
+            """
+            create table reporting.rpt_laps (
+                dim_sessions_key integer, meeting_name varchar, session_name varchar,
+                name_acronym varchar, team_name varchar, first_name varchar,
+                last_name varchar, lap_number integer, lap_duration double,
+                lap_duration_smoothened double, is_pit_in_lap boolean,
+                is_pit_out_lap boolean, pit_duration double, team_colour varchar
+            )
+            """
+        )
+        conn.execute(
+            """
+            create table modeling.dim_sessions (
+                dim_sessions_key integer, dim_race_weekends_key integer,
+                session_name varchar, date_start timestamp
+            )
+            """
+        )
+        conn.execute(
+            """
+            create table modeling.dim_race_weekends (
+                dim_race_weekends_key integer, year integer, meeting_name varchar
+            )
+            """
+        )
+        conn.execute(
+            "insert into modeling.dim_sessions values (1, 10, 'Race', '2024-03-02')"
+        )
+        conn.execute("insert into modeling.dim_race_weekends values (10, 2024, 'Test')")
+        for lap_number in range(1, 4):
+            insert_lap(conn, lap_number, 90.0 + lap_number)
+    return path
+
+
+@pytest.fixture
+def server(database: Path):
+    api = ReportingApi(
+        query_registry=QueryRegistry(),
+        connection=LocalDuckDBConnection(database=str(database)),
+        chunk_rows=2,
+    )
+    server = ReportingApiServer(("127.0.0.1", 0), api)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(
+    server: ReportingApiServer, path: str, headers: dict[str, str] | None = None
+):
+    conn = HTTPConnection(*server.server_address[:2])
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_laps_as_json(server: ReportingApiServer) -> None:
+    """Test that lap data is streamed as a JSON array of records."""
+    response, body = request(server, "/sessions/1/laps")
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/json"
+    assert response.getheader("ETag")
+    laps = json.loads(body)
+    assert [lap["lap_number"] for lap in laps] == [1, 2, 3]
+    assert laps[0]["name_acronym"] == "VER"
+
+
+def test_laps_as_arrow(server: ReportingApiServer) -> None:
+    """Test that lap data is served as an Arrow IPC stream."""
+    response, body = request(
+        server,
+        "/sessions/1/laps",
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert response.status == 200
+    table = pa.ipc.open_stream(io.BytesIO(body)).read_all()
+    assert table.num_rows == 3
+    assert "lap_duration" in table.column_names
+
+
+def test_race_weekends_and_drivers(server: ReportingApiServer) -> None:
+    """Test the race weekend and driver endpoints."""
+    _, body = request(server, "/race-weekends")
+    assert json.loads(body)[0]["race_weekend"] == "2024 - Test"
+
+    _, body = request(server, "/sessions/1/drivers?format=json")
+    assert json.loads(body) == [
+        {"team_name": "Red Bull", "driver_full_name": "Max Verstappen"}
+    ]
+
+
+def test_gzip_compression(server: ReportingApiServer) -> None:
+    """Test that responses are gzip encoded when requested."""
+    response, body = request(
+        server, "/sessions/1/laps", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert len(json.loads(zlib.decompress(body, wbits=31))) == 3
+
+
+def test_etag_not_modified(server: ReportingApiServer, database: Path) -> None:
+    """Test If-None-Match handling and ETag changes when session data changes."""
+    server.api.version_ttl = 0
+    response, _ = request(server, "/sessions/1/laps")
+    etag = response.getheader("ETag")
+
+    response, body = request(
+        server, "/sessions/1/laps", headers={"If-None-Match": etag}
+    )
+    assert response.status == 304
+    assert body == b""
+
+    with duckdb.connect(str(database)) as conn:
+        insert_lap(conn, 4, 95.0)
+
+    response, body = request(
+        server, "/sessions/1/laps", headers={"If-None-Match": etag}
+    )
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+    assert len(json.loads(body)) == 4
+
+
+@pytest.mark.parametrize(
+    "path, update",
+    [
+        ("/sessions/1/drivers", "update reporting.rpt_laps set team_name = 'RBR'"),
+        ("/sessions/1/laps", "update reporting.rpt_laps set is_pit_in_lap = true"),
+        ("/sessions/1/laps", "update reporting.rpt_laps set team_colour = '#000000'"),
+        ("/race-weekends", "update modeling.dim_race_weekends set meeting_name = 'X'"),
+    ],
+)
+def test_etag_changes_on_in_place_update(
+    server: ReportingApiServer, database: Path, path: str, update: str
+) -> None:
+    """Test that correcting rows in place changes the ETag and the cached body."""
+    server.api.version_ttl = 0
+    response, before = request(server, path)
+    etag = response.getheader("ETag")
+
+    with duckdb.connect(str(database)) as conn:
+        conn.execute(update)
+
+    response, after = request(server, path, headers={"If-None-Match": etag})
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+    assert after != before
+
+
+def test_revalidation_uses_cached_version(
+    server: ReportingApiServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a 304 within the version TTL does not query the warehouse."""
+    response, _ = request(server, "/sessions/1/laps")
+    etag = response.getheader("ETag")
+
+    connection = server.api.connection
+    monkeypatch.setattr(connection, "execute_query", MagicMock())
+    monkeypatch.setattr(connection, "execute_queries", MagicMock())
+    response, _ = request(server, "/sessions/1/laps", headers={"If-None-Match": etag})
+
+    assert response.status == 304
+    connection.execute_query.assert_not_called()
+    connection.execute_queries.assert_not_called()
+
+
+def test_snapshot_version_matches_data(
+    server: ReportingApiServer, database: Path
+) -> None:
+    """Test that data is cached under the version it was read at, not a stale one."""
+    api = server.api
+    stale_version = api.get_version("laps", sessions_key=1)
+    with duckdb.connect(str(database)) as conn:
+        insert_lap(conn, 4, 95.0)
+
+    version, df = api.get_snapshot("laps", stale_version, sessions_key=1)
+
+    assert version != stale_version
+    assert len(df) == 4
+    assert api.get_version("laps", sessions_key=1) == version
+    assert api.result_cache.get(("laps", 1, stale_version)) is None
+
+
+def test_cached_body_reused(server: ReportingApiServer) -> None:
+    """Test that encoded bodies are cached per data version."""
+    _, first = request(server, "/sessions/1/laps")
+    _, second = request(server, "/sessions/1/laps")
+
+    assert first == second
+    assert len(server.api.body_cache) == 1
+    assert len(server.api.result_cache) == 1
+
+
+def test_error_after_headers_truncates_response(
+    server: ReportingApiServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a mid-stream failure truncates the response instead of corrupting it."""
+
+    def failing_serializer(df, chunk_rows):
+        yield b"["
+        raise ValueError("Serialization failed")
+
+    monkeypatch.setitem(
+        reporting.api.SERIALIZERS, "json", ("application/json", failing_serializer)
+    )
+    with socket.create_connection(server.server_address[:2], timeout=5) as sock:
+        sock.sendall(b"GET /sessions/1/laps HTTP/1.1\r\nHost: test\r\n\r\n")
+        raw = b""
+        while chunk := sock.recv(65536):
+            raw += chunk
+
+    headers, _, body = raw.partition(b"\r\n\r\n")
+    assert headers.startswith(b"HTTP/1.1 200")
+    assert body == b"1\r\n[\r\n"
+    assert len(server.api.body_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "path, status",
+    [
+        ("/sessions/999/laps", 404),
+        ("/unknown", 404),
+        ("/sessions/1/laps?format=csv", 400),
+    ],
+)
+def test_errors(server: ReportingApiServer, path: str, status: int) -> None:
+    """Test error responses."""
+    response, body = request(server, path)
+
+    assert response.status == status
+    assert "error" in json.loads(body)
+
+
+def test_negotiate_encoding() -> None:
+    """Test Accept-Encoding negotiation."""
+    assert negotiate_encoding(None) == "identity"
+    assert negotiate_encoding("br") == "identity"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") == "identity"
+    assert negotiate_encoding("gzip;q=0, *") in ("identity", "zstd")
+    assert negotiate_encoding("*;q=0, identity") == "identity"
+    assert negotiate_encoding("gzip;q=1..0") == "gzip"
+    assert negotiate_encoding("gzip;q=abc, br") == "gzip"
+    assert negotiate_encoding("gzip;q=0.5") == "gzip"
+
+
+@pytest.mark.parametrize(
+    "accept_encoding", ["identity;q=0", "*;q=0", "gzip;q=0, *;q=0"]
+)
+def test_negotiate_encoding_not_acceptable(
+    accept_encoding: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that refusing every supported coding is rejected."""
+    monkeypatch.setattr(reporting.api, "zstandard", None)
+    with pytest.raises(ApiError) as exc_info:
+        negotiate_encoding(accept_encoding)
+    assert exc_info.value.status == 406
+
+
+def test_negotiate_encoding_ranks_by_qvalue(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the highest q-value wins over the server preference."""
+    monkeypatch.setattr(reporting.api, "zstandard", MagicMock())
+    assert negotiate_encoding("gzip;q=1, zstd;q=0.1") == "gzip"
+    assert negotiate_encoding("gzip, zstd") == "zstd"
+    assert negotiate_encoding("identity, gzip;q=0.5") == "identity"
+
+
+def test_negotiate_encoding_gzip_refused_with_wildcard(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that `*` does not select a coding the client refused."""
+    monkeypatch.setattr(reporting.api, "zstandard", None)
+    assert negotiate_encoding("gzip;q=0, *") == "identity"
@@ -1,8 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock, PropertyMock
 import pytest
 import pandas as pd
+import duckdb
 from duckdb import ConnectionException
-from reporting.connection import MotherDuckConnection, MotherDuckSettings
+from reporting.connection import (
+    LocalDuckDBConnection,
+    MotherDuckConnection,
+    MotherDuckSettings,
+)
 
 
 @pytest.fixture
@@ -84,6 +90,22 @@ def test_execute_query_without_params(
     mock_conn.execute.assert_called_once_with(query, None)
 
 
+def test_execute_queries_in_one_transaction(
+    mock_settings: MotherDuckSettings, mock_connection: tuple[MagicMock, MagicMock]
+):
+    mock_connect, mock_conn = mock_connection
+    connection = MotherDuckConnection()
+
+    result = connection.execute_queries([("SELECT 1", None), ("SELECT ?", [2])])
+
+    assert len(result) == 2
+    mock_connect.assert_called_once()
+    mock_conn.begin.assert_called_once()
+    mock_conn.execute.assert_any_call("SELECT 1", None)
+    mock_conn.execute.assert_any_call("SELECT ?", [2])
+    mock_conn.rollback.assert_called_once()
+
+
 def test_connection_cleanup(
     mock_settings: MotherDuckSettings, mock_connection: tuple[MagicMock, MagicMock]
 ):
@@ -94,3 +116,38 @@ def test_connection_cleanup(
         pass
 
     mock_conn.close.assert_called_once()
+
+
+def test_concurrent_queries_on_shared_connection(tmp_path):
+    database = tmp_path / "warehouse.duckdb"
+    with duckdb.connect(str(database)) as conn:
+        conn.execute("create table laps as select range as lap_number from range(100)")
+    connection = LocalDuckDBConnection(database=str(database))
+
+    def run_queries() -> list[int]:
+        return [
+            len(
+                connection.execute_query(
+                    "select * from laps where lap_number < ?", [50]
+                )
+            )
+            for _ in range(30)
+        ]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = [
+            future.result()
+            for future in [executor.submit(run_queries) for _ in range(4)]
+        ]
+
+    assert results == [[50] * 30] * 4
+
+
+def test_local_connection_is_read_only(tmp_path):
+    database = tmp_path / "warehouse.duckdb"
+    with duckdb.connect(str(database)) as conn:
+        conn.execute("create table laps (lap_number integer)")
+    connection = LocalDuckDBConnection(database=str(database))
+
+    with pytest.raises(duckdb.InvalidInputException, match="read-only"):
+        connection.execute_query("insert into laps values (1)")
@@ -0,0 +1,55 @@
+import json
+
+from benchmarks.import_time import (
+    ImportTiming,
+    compare_to_history,
+    load_history,
+    parse_importtime,
+    summarize,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   pandas._libs
+import time:       200 |        300 | pandas
+import time:       100 |        100 | altair
+some other stderr line
+"""
+
+
+def test_parse_importtime() -> None:
+    """Test parsing `python -X importtime` output"""
+    timings = parse_importtime(IMPORTTIME_OUTPUT)
+    assert timings == [
+        ImportTiming("pandas._libs", 100, 100),
+        ImportTiming("pandas", 200, 300),
+        ImportTiming("altair", 100, 100),
+    ]
+
+
+def test_summarize() -> None:
+    """Test aggregating timings by top-level package"""
+    summary = summarize(parse_importtime(IMPORTTIME_OUTPUT), top=1)
+    assert summary == {"total_ms": 0.4, "packages": {"pandas": 0.3}}
+
+
+def report(total_ms: float) -> dict:
+    return {"results": {"first_render": {"total_ms": total_ms, "packages": {}}}}
+
+
+def test_load_history(tmp_path) -> None:
+    """Test reading reports appended to a history file"""
+    path = tmp_path / "history.jsonl"
+    assert load_history(str(path)) == []
+
+    path.write_text(json.dumps(report(100.0)) + "\n" + json.dumps(report(200.0)) + "\n")
+    assert load_history(str(path)) == [report(100.0), report(200.0)]
+
+
+def test_compare_to_history() -> None:
+    """Test that the baseline is the median of the most recent runs"""
+    history = [report(1000.0)] + [report(ms) for ms in (100.0, 120.0, 110.0)]
+    assert compare_to_history(report(150.0), history, window=3) == {
+        "first_render": 110.0
+    }
+    assert compare_to_history(report(150.0), []) == {}
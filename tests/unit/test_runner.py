@@ -1,7 +1,9 @@
 from unittest.mock import MagicMock
 import pytest
 import pandas as pd
-from reporting.runner import ReportingRunner
+import streamlit as st
+import reporting.runner
+from reporting.runner import ReportingRunner, get_cached_smoothed_lap_duration
 from reporting.query_registry import QueryRegistry
 from reporting.connection import MotherDuckConnection
 
@@ -83,3 +85,101 @@ def test_get_drivers(
         "SELECT * FROM test", params=[session_key]
     )
     pd.testing.assert_frame_equal(result, expected_df)
+
+
+class FakeSessionState(dict):
+    """Dict with the attribute access of `st.session_state`."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def session_state(monkeypatch: pytest.MonkeyPatch) -> FakeSessionState:
+    state = FakeSessionState()
+    monkeypatch.setattr(st, "session_state", state)
+    return state
+
+
+@pytest.fixture
+def smooth_lap_duration(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    get_cached_smoothed_lap_duration.clear()
+    mock = MagicMock(side_effect=reporting.runner.smooth_lap_duration)
+    monkeypatch.setattr(reporting.runner, "smooth_lap_duration", mock)
+    yield mock
+    get_cached_smoothed_lap_duration.clear()
+
+
+def laps(lap_duration: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name_acronym": "VER",
+            "lap_number": range(1, len(lap_duration) + 1),
+            "lap_duration": lap_duration,
+            "is_pit_in_lap": False,
+            "is_pit_out_lap": False,
+        }
+    )
+
+
+def test_smoothed_lap_duration_computed_once_per_policy(
+    runner: ReportingRunner,
+    mock_connection: MagicMock,
+    session_state: FakeSessionState,
+    smooth_lap_duration: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that each policy is smoothed once and shared between browser sessions."""
+    mock_connection.execute_query.return_value = laps([90.0, 91.0, 92.0])
+    runner._load_all_session_data(sessions_key=1)
+
+    runner._get_smoothed_lap_duration(1, "None")
+    runner._get_smoothed_lap_duration(1, "None")
+    runner._get_smoothed_lap_duration(1, "Clip to 5th-95th percentile")
+    assert smooth_lap_duration.call_count == 2
+
+    # A second viewer loading the same data reuses the process-wide cache
+    monkeypatch.setattr(st, "session_state", FakeSessionState())
+    runner._load_all_session_data(sessions_key=1)
+    runner._get_smoothed_lap_duration(1, "None")
+    assert smooth_lap_duration.call_count == 2
+
+
+def test_smoothed_lap_duration_cleared_on_refresh(
+    runner: ReportingRunner,
+    mock_connection: MagicMock,
+    session_state: FakeSessionState,
+    smooth_lap_duration: MagicMock,
+) -> None:
+    """Test that refreshing the data drops the cached smoothed lap durations."""
+    mock_connection.execute_query.return_value = laps([90.0, 91.0, 92.0])
+    runner._load_all_session_data(sessions_key=1)
+    runner._get_smoothed_lap_duration(1, "None")
+
+    runner._refresh_session_data(sessions_key=1)
+    runner._get_smoothed_lap_duration(1, "None")
+
+    assert smooth_lap_duration.call_count == 2
+
+
+def test_smoothed_lap_duration_follows_race_change(
+    runner: ReportingRunner,
+    mock_connection: MagicMock,
+    session_state: FakeSessionState,
+    smooth_lap_duration: MagicMock,
+) -> None:
+    """Test that a race change smooths the new session data, not old results."""
+    mock_connection.execute_query.return_value = laps([90.0, 91.0, 92.0])
+    runner._load_all_session_data(sessions_key=1)
+    first_version = session_state.lap_data_version
+    runner._get_smoothed_lap_duration(1, "None")
+
+    runner._clear_session_data()
+    assert "lap_data_version" not in session_state
+    mock_connection.execute_query.return_value = laps([80.0, 81.0])
+    runner._load_all_session_data(sessions_key=2)
+    result = runner._get_smoothed_lap_duration(2, "None")
+
+    assert session_state.lap_data_version != first_version
+    assert smooth_lap_duration.call_count == 2
+    assert result.tolist() == [80.0, 81.0]
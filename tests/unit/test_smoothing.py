@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from reporting.smoothing import (
+    SMOOTHING_POLICIES,
+    clip_percentile_laps,
+    flag_outlier_laps,
+    interpolate_outlier_laps,
+    median_outlier_laps,
+    smooth_lap_duration,
+)
+
+
+@pytest.fixture
+def laps_df() -> pd.DataFrame:
+    # Rows deliberately out of order to check results stay aligned to the index
+    return pd.DataFrame(
+        {
+            "name_acronym": ["VER", "VER", "VER", "VER", "VER", "HAM", "HAM", "HAM"],
+            "lap_number": [1, 2, 3, 4, 5, 2, 1, 3],
+            "lap_duration": [90.0, 110.0, 92.0, 140.0, 91.0, 95.0, 93.0, 94.0],
+            "is_pit_in_lap": [False, True, False, False, False, False, False, None],
+            "is_pit_out_lap": [False, False, False, False, False, False, False, None],
+        },
+        index=[10, 11, 12, 13, 14, 20, 21, 22],
+    )
+
+
+def test_flag_outlier_laps(laps_df: pd.DataFrame) -> None:
+    """Test that pit laps and laps far off the median pace are flagged"""
+    flags = flag_outlier_laps(laps_df)
+    assert flags[flags].index.tolist() == [11, 13]
+
+
+def test_interpolate_outlier_laps(laps_df: pd.DataFrame) -> None:
+    """Test that outlier laps are interpolated between clean neighbours"""
+    result = interpolate_outlier_laps(laps_df)
+    assert result.index.tolist() == laps_df.index.tolist()
+    assert result[11] == pytest.approx(91.0)
+    assert result[13] == pytest.approx(91.5)
+    assert result[[10, 12, 14, 20, 21, 22]].tolist() == [90, 92, 91, 95, 93, 94]
+
+
+def test_interpolate_outlier_laps_at_stint_edge(laps_df: pd.DataFrame) -> None:
+    """Test that outliers without a clean lap after them use the driver median"""
+    laps_df.loc[14, "lap_duration"] = 150.0
+    result = interpolate_outlier_laps(laps_df)
+    assert result[14] == pytest.approx(91.0)
+
+
+def test_median_outlier_laps(laps_df: pd.DataFrame) -> None:
+    """Test that outlier laps are replaced with the driver median"""
+    result = median_outlier_laps(laps_df)
+    assert result[11] == pytest.approx(91.0)
+    assert result[13] == pytest.approx(91.0)
+    assert result[20] == 95.0
+
+
+def test_clip_percentile_laps(laps_df: pd.DataFrame) -> None:
+    """Test that laps are clipped to the driver's percentiles"""
+    result = clip_percentile_laps(laps_df, percentiles=(0.0, 0.5))
+    assert result[13] == 92.0
+    assert result[10] == 90.0
+    assert result[20] == 94.0
+
+
+def test_smooth_lap_duration_policies(laps_df: pd.DataFrame) -> None:
+    """Test that every policy returns one value per lap"""
+    pd.testing.assert_series_equal(
+        smooth_lap_duration(laps_df, policy="None"), laps_df["lap_duration"]
+    )
+    for policy in SMOOTHING_POLICIES:
+        result = smooth_lap_duration(laps_df, policy=policy)
+        assert result.index.tolist() == laps_df.index.tolist()
+        assert result.notna().all()